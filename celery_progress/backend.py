@@ -1,17 +1,51 @@
 import datetime
 import logging
-from abc import ABCMeta, abstractmethod
+import threading
+import time
+from abc import ABC, abstractmethod
 
-from celery.result import EagerResult, allow_join_result
+from celery.result import EagerResult
 from celery.backends.base import DisabledBackend
 
 logger = logging.getLogger(__name__)
 
 PROGRESS_STATE = 'PROGRESS'
 
+_IN_FLIGHT_STATES = frozenset(('PENDING', 'STARTED'))
+_COMPLETED_STATES = frozenset(('SUCCESS', 'FAILURE'))
+_RETRY_STATES = frozenset(('RETRY', 'REVOKED'))
 
-class AbstractProgressRecorder(object):
-    __metaclass__ = ABCMeta
+
+def _progress_math(ratio, elapsed_s):
+    """
+    Returns (unrounded percent, percent_int, est_time_remaining_s), compiled with numba when enabled.
+    Rounding percent is left to the caller since numba's round() isn't correctly rounded like CPython's.
+    """
+    if not ratio:
+        return 0.0, 0, -1
+    percent_100 = ratio * 100.0
+    percent_int = int(percent_100) or 1
+    return percent_100, percent_int, int(elapsed_s * (1.0 - ratio) / ratio)
+
+
+def _compile_progress_math():
+    """Swaps in a numba-compiled _progress_math. Run once per worker process, see tasks.py."""
+    global _progress_math
+    try:
+        from numba import njit
+    except ImportError:
+        logger.warning(
+            'CELERY_PROGRESS_NUMBA is set but numba is not installed. '
+            'Use pip install celery-progress[numba] to enable it.'
+        )
+        return
+    _progress_math = njit(cache=True)(_progress_math)
+    # compile (or load from numba's cache) now rather than in the worker's first task
+    _progress_math(0.5, 0.0)
+
+
+class AbstractProgressRecorder(ABC):
+    __slots__ = ()
 
     @abstractmethod
     def set_progress(self, current, total, description=""):
@@ -24,54 +58,168 @@ class ConsoleProgressRecorder(AbstractProgressRecorder):
         print('processed {} items of {}. {}'.format(current, total, description))
 
 
+class _ProgressMeta(object):
+    """The last progress a recorder published, updated in place after every successful write."""
+    __slots__ = (
+        'pending', 'current', 'total', 'percent', 'percent_int', 'description', 'start_time', 'est_time_remaining_s',
+    )
+
+    def __init__(self, start_time):
+        self.pending = False
+        self.current = -1
+        self.total = 0
+        self.percent = 0.0
+        self.percent_int = -1
+        self.description = None
+        self.start_time = start_time
+        self.est_time_remaining_s = -1
+
+
 class ProgressRecorder(AbstractProgressRecorder):
+    __slots__ = (
+        'task', 'start_time', '_background', '_start_monotonic', '_min_interval_s',
+        '_meta', '_last_pub_t', '_last_state_meta',
+    )
 
-    def __init__(self, task):
+    def __init__(self, task, min_interval_s=0.25, background=False):
+        """
+        min_interval_s:
+            minimum number of seconds between two result backend writes that
+            don't change the integer percentage. Completion is always written.
+        background:
+            write updates from a background thread instead of the task's own.
+            The task must call flush() before returning or raising.
+        """
         self.task = task
+        self._background = background
         self.start_time = datetime.datetime.now()
+        self._start_monotonic = time.monotonic()
+        self._min_interval_s = min_interval_s
+        # start_time is serialized once here rather than by the result backend on every update
+        self._meta = _ProgressMeta(self.start_time.isoformat())
+        self._last_pub_t = 0.0
+        self._last_state_meta = None
 
     def set_progress(self, current: int, total: int, description: str=""):
+        return self._record(current, total, current / total if total else 0.0, description)
+
+    def bind_total(self, total: int):
+        """
+        Returns a tick(current, description="") function that records progress
+        against a fixed total, for loops where total doesn't change.
+        """
+        def tick(current, description=""):
+            return self.set_progress(current, total, description)
+
+        return tick
+
+    def _record(self, current, total, ratio, description):
+        last = self._meta
+        if current == last.current and total == last.total and description == last.description:
+            # repeated tick, already published
+            return self._last_state_meta
+        now = time.monotonic()
+        percent_100, percent_int, est_time_remaining_s = _progress_math(ratio, now - self._start_monotonic)
+        if (current != total and percent_int == last.percent_int
+                and description == last.description
+                and (now - self._last_pub_t) < self._min_interval_s):
+            # nothing visible changed recently, skip the backend round-trip
+            return self._last_state_meta
         state = PROGRESS_STATE
+        percent = (round(percent_100, 2) or 1.0) if percent_100 else 0.0
         meta = {
-            'pending': False,
+            'pending': last.pending,
             'current': current,
             'total': total,
-            'percent': self._percent_float(current, total),
-            'percent_int': self._percent_int(current, total),
+            'percent': percent,
+            'percent_int': percent_int,
             'description': description,
-            'start_time': self.start_time,
-            'est_time_remaining_s': self._est_time(current, total, self.start_time)
+            'start_time': last.start_time,
+            'est_time_remaining_s': est_time_remaining_s
         }
-        self.task.update_state(
-            state=state,
-            meta=meta
-        )
+        if self._background:
+            # captured on the task's thread, the request context is thread-local
+            request = self.task.request
+            _publisher.put(request.id, self._publish, state, meta, request)
+        else:
+            self._publish(state, meta)
+        # only remembered once published, so a failed write is retried by the next identical call
+        last.current = current
+        last.total = total
+        last.percent = percent
+        last.percent_int = percent_int
+        last.description = description
+        last.est_time_remaining_s = est_time_remaining_s
+        self._last_pub_t = now
+        self._last_state_meta = state, meta
         return state, meta
 
-    def _percent_float(self, current: int, total: int):
-        if current == 0 or total == 0:
-            return 0.0
-        percent = float(round(((current / total) * 100.0), 2))
-        return 1.0 if (percent == 0 and current > 0) else percent
-
-    def _percent_int(self, current: int, total: int):
-        if current == 0 or total == 0:
-            return 0
-        percent = int((current / total) * 100.0)
-        return 1 if (percent == 0 and current > 0) else percent
-
-    def _est_time(self, current: int, total: int, start_time: datetime.datetime):
-        if current == 0 or total == 0:
-            return -1
-        curr_time = datetime.datetime.now()
-        diff_time = curr_time - start_time
-        diff_s = float(diff_time.seconds)
-        perc = ((current / total) * 100.0)
-        time_total_s = (diff_s * (100.0 / perc))
-        time_remain_s = int(time_total_s - diff_s)
-        return time_remain_s
+    def flush(self):
+        """
+        Block until any update queued in the background has been written.
+        Must also run when the task fails (e.g. in a finally block), otherwise
+        a late PROGRESS write can overwrite the stored FAILURE.
+        """
+        if self._background:
+            _publisher.flush(self.task.request.id)
+
+    def _publish(self, state, meta, request=None):
+        if request is None:
+            self.task.update_state(
+                state=state,
+                meta=meta
+            )
+        else:
+            # off the task's thread: write what update_state would, with the request captured on it
+            self.task.backend.store_result(request.id, meta, state, request=request)
+
+
+class _BackgroundPublisher(object):
+    """Writes progress updates from a daemon thread, keeping only the newest pending update per task."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._in_flight = None
+        self._thread = None
+
+    def put(self, task_id, publish, state, meta, request):
+        with self._cond:
+            self._pending[task_id] = (publish, state, meta, request)
+            # started lazily so each forked worker process gets its own thread
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='celery-progress-publisher', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, task_id):
+        with self._cond:
+            while task_id in self._pending or self._in_flight == task_id:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                task_id = next(iter(self._pending))
+                publish, state, meta, request = self._pending.pop(task_id)
+                self._in_flight = task_id
+            try:
+                publish(state, meta, request)
+            except Exception:
+                logger.exception('Failed to publish progress for task %s', task_id)
+            finally:
+                with self._cond:
+                    self._in_flight = None
+                    self._cond.notify_all()
+
+
+_publisher = _BackgroundPublisher()
+
 
 class Progress(object):
+    __slots__ = ('result',)
 
     def __init__(self, result):
         """
@@ -81,63 +229,68 @@ class Progress(object):
         self.result = result
 
     def get_info(self):
-        response = {'state': self.result.state}
-        if self.result.result is None:
+        # AsyncResult.state/.info each hit the result backend, so read them once
+        meta = _get_task_meta(self.result)
+        state = meta['status']
+        info = meta['result']
+        response = {'state': state}
+        if info is None:
             response.update({
                 'complete': True,
                 'success': None,
-                'progress': _get_unknown_progress(self.result.state),
+                'progress': _get_unknown_progress(state),
             })
             return response
-        if self.result.state in ['SUCCESS', 'FAILURE']:
-            success = self.result.successful()
-            with allow_join_result():
-                response.update({
-                    'complete': True,
-                    'success': success,
-                    'progress': _get_completed_progress(),
-                    'result': self.result.get(self.result.id) if success else str(self.result.info),
-                })
-        elif self.result.state in ['RETRY', 'REVOKED']:
-            if self.result.state == 'RETRY':
-                retry = self.result.info
+        # most polls happen while the task is running
+        if state == PROGRESS_STATE:
+            response.update({
+                'complete': False,
+                'success': None,
+                'progress': info,
+            })
+        elif state in _IN_FLIGHT_STATES:
+            response.update({
+                'complete': False,
+                'success': None,
+                'progress': _get_pending_progress(state),
+            })
+        elif state in _COMPLETED_STATES:
+            # the task is done, so its return value is already in info
+            success = state == 'SUCCESS'
+            response.update({
+                'complete': True,
+                'success': success,
+                'progress': _get_completed_progress(),
+                'result': info if success else str(info),
+            })
+        elif state in _RETRY_STATES:
+            if state == 'RETRY':
+                retry = info
                 when = str(retry.when) if isinstance(retry.when, datetime.datetime) else str(
                         datetime.datetime.now() + datetime.timedelta(seconds=retry.when))
                 result = {'when': when, 'message': retry.message or str(retry.exc)}
             else:
-                result = 'Task ' + str(self.result.info)
+                result = 'Task ' + str(info)
             response.update({
                 'complete': True,
                 'success': False,
                 'progress': _get_completed_progress(),
                 'result': result,
             })
-        elif self.result.state == 'IGNORED':
+        elif state == 'IGNORED':
             response.update({
                 'complete': True,
                 'success': None,
                 'progress': _get_completed_progress(),
-                'result': str(self.result.info)
-            })
-        elif self.result.state == PROGRESS_STATE:
-            response.update({
-                'complete': False,
-                'success': None,
-                'progress': self.result.info,
-            })
-        elif self.result.state in ['PENDING', 'STARTED']:
-            response.update({
-                'complete': False,
-                'success': None,
-                'progress': _get_pending_progress(self.result.state),
+                'result': str(info)
             })
         else:
-            logger.error('Task %s has unknown state %s with metadata %s', self.result.id, self.result.state, self.result.info)
+            logger.error('Task %s has unknown state %s with metadata %s', self.result.id, state, info)
             response.update({
                 'complete': True,
                 'success': False,
-                'progress': _get_unknown_progress(self.result.state),
-                'result': 'Unknown state {}'.format(self.result.state),
+                'progress': _get_unknown_progress(state),
+                'result': 'Unknown state {}'.format(state),
             })
         return response
 
@@ -161,37 +314,67 @@ class KnownResult(EagerResult):
         pass
 
 
+class _ReadOnlyDict(dict):
+    """
+    A dict that refuses modification, for the progress templates shared by every response.
+    Unlike types.MappingProxyType it is still a dict, so json.dumps and channel layers can serialize it.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('{} is read-only'.format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+_COMPLETED_PROGRESS = _ReadOnlyDict({
+    'pending': False,
+    'current': 100,
+    'total': 100,
+    'percent': 100.0,
+    'percent_int': 100,
+    'start_time': None,
+    'est_time_remaining_s': 0
+})
+
+_UNKNOWN_PROGRESS = _ReadOnlyDict({
+    'pending': False,
+    'current': 0,
+    'total': 100,
+    'percent': None,
+    'percent_int': None,
+    'start_time': None,
+    'est_time_remaining_s': None
+})
+
+_PENDING_PROGRESS = _ReadOnlyDict({
+    'pending': True,
+    'current': 0,
+    'total': 100,
+    'percent': -1.0,
+    'percent_int': -1,
+    'start_time': None,
+    'est_time_remaining_s': -1
+})
+
+
+def _get_task_meta(result):
+    if hasattr(result, '_get_task_meta'):
+        return result._get_task_meta()
+    return {'status': result.state, 'result': result.result}
+
+
 def _get_completed_progress():
-    return {
-        'pending': False,
-        'current': 100,
-        'total': 100,
-        'percent': 100.0,
-        'percent_int': 100,
-        'start_time': None,
-        'est_time_remaining_s': 0
-    }
+    return _COMPLETED_PROGRESS
 
 
 def _get_unknown_progress(state):
-    return {
-        'pending': False,
-        'current': 0,
-        'total': 100,
-        'percent': None,
-        'percent_int': None,
-        'start_time': None,
-        'est_time_remaining_s': None
-    }
+    return _UNKNOWN_PROGRESS
 
 
 def _get_pending_progress(state):
-    return {
-        'pending': True,
-        'current': 0,
-        'total': 100,
-        'percent': -1.0,
-        'percent_int': -1,
-        'start_time': None,
-        'est_time_remaining_s': -1
-    }
+    return _PENDING_PROGRESS
@@ -1,4 +1,7 @@
-from celery.signals import task_postrun
+from celery.signals import task_postrun, worker_process_init
+from django.conf import settings
+
+from celery_progress.backend import _compile_progress_math
 
 
 @task_postrun.connect(retry=True)
@@ -9,3 +12,12 @@ def task_postrun_handler(**kwargs):
     if kwargs.pop('state') == 'IGNORED':
         task = kwargs.pop('task')
         task.update_state(state='IGNORED', meta=str(kwargs.pop('retval')))
+
+
+@worker_process_init.connect
+def worker_process_init_handler(**kwargs):
+    """Runs in each new worker process. Compiles the progress math with numba if CELERY_PROGRESS_NUMBA is set.
+
+    Done here so the numba import and compile don't land in the process's first task."""
+    if getattr(settings, 'CELERY_PROGRESS_NUMBA', False):
+        _compile_progress_math()
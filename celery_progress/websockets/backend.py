@@ -38,8 +38,9 @@ class WebSocketProgressRecorder(ProgressRecorder):
             if final and channel_layer:  # Send error back to post-run handler for a retry
                 raise e
 
-    def set_progress(self, current, total, description=""):
-        state, meta = super().set_progress(current, total, description)
-        result = KnownResult(self.task.request.id, meta, state)
+    def _publish(self, state, meta, request=None):
+        super()._publish(state, meta, request)
+        task_id = (request or self.task.request).id
+        result = KnownResult(task_id, meta, state)
         data = Progress(result).get_info()
-        self.push_update(self.task.request.id, data)
+        self.push_update(task_id, data)
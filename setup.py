@@ -46,6 +46,7 @@ setup(
     extras_require={
         'websockets': ['channels'],
         'redis': ['channels_redis'],
-        'rabbitmq': ['channels_rabbitmq']
+        'rabbitmq': ['channels_rabbitmq'],
+        'numba': ['numba'],
     }
 )
@@ -0,0 +1,195 @@
+import threading
+import unittest
+
+from celery_progress.backend import ProgressRecorder
+
+
+class FakeBackend(object):
+
+    def __init__(self):
+        self.writes = []
+
+    @property
+    def metas(self):
+        return [meta for _, _, meta, _ in self.writes]
+
+    def store_result(self, task_id, result, state, traceback=None, request=None, **kwargs):
+        self.writes.append((task_id, state, result, request))
+
+
+class BlockingBackend(FakeBackend):
+    """Holds the first write until released, so tests can queue updates behind an in-flight one."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def store_result(self, *args, **kwargs):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        super().store_result(*args, **kwargs)
+
+
+class FailingBackend(FakeBackend):
+    """Raises on the first write only."""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    def store_result(self, *args, **kwargs):
+        if not self.failed:
+            self.failed = True
+            raise ConnectionError('backend unavailable')
+        super().store_result(*args, **kwargs)
+
+
+class FakeRequest(object):
+
+    def __init__(self, id=None):
+        self.id = id
+
+
+class FakeTask(object):
+    """Mimics celery's Task: the request is thread-local and update_state writes with it."""
+
+    def __init__(self, task_id='task-id', backend=None):
+        self.backend = backend or FakeBackend()
+        self.update_state_calls = 0
+        self._task_id = task_id
+        self._local = threading.local()
+
+    @property
+    def request(self):
+        if not hasattr(self._local, 'request'):
+            self._local.request = FakeRequest(self._task_id if threading.current_thread() is threading.main_thread()
+                                              else None)
+        return self._local.request
+
+    def update_state(self, task_id=None, state=None, meta=None, **kwargs):
+        self.update_state_calls += 1
+        self.backend.store_result(task_id or self.request.id, meta, state, request=self.request, **kwargs)
+
+
+class CoalescingTest(unittest.TestCase):
+
+    def _recorder(self, min_interval_s=3600):
+        task = FakeTask()
+        return task, ProgressRecorder(task, min_interval_s=min_interval_s)
+
+    def test_skips_unchanged_percent_within_interval(self):
+        task, recorder = self._recorder()
+        first = recorder.set_progress(1, 1000)
+        # 0.1% and 0.2% both report percent_int 1
+        self.assertEqual(recorder.set_progress(2, 1000), first)
+        self.assertEqual([meta['current'] for meta in task.backend.metas], [1])
+
+    def test_writes_when_percent_changes(self):
+        task, recorder = self._recorder()
+        recorder.set_progress(1, 1000)
+        recorder.set_progress(20, 1000)
+        self.assertEqual([meta['percent_int'] for meta in task.backend.metas], [1, 2])
+
+    def test_writes_after_interval(self):
+        task, recorder = self._recorder(min_interval_s=0)
+        recorder.set_progress(1, 1000)
+        recorder.set_progress(2, 1000)
+        self.assertEqual([meta['current'] for meta in task.backend.metas], [1, 2])
+
+    def test_always_writes_completion(self):
+        task, recorder = self._recorder()
+        recorder.set_progress(100, 100)
+        # same percent_int and description, but a completion is never skipped
+        recorder.set_progress(200, 200)
+        self.assertEqual([meta['current'] for meta in task.backend.metas], [100, 200])
+
+    def test_writes_on_description_change(self):
+        task, recorder = self._recorder()
+        recorder.set_progress(1, 1000, 'downloading')
+        state, meta = recorder.set_progress(2, 1000, 'parsing')
+        self.assertEqual([meta['description'] for meta in task.backend.metas], ['downloading', 'parsing'])
+        self.assertEqual(meta['current'], 2)
+
+    def test_failed_write_is_retried(self):
+        task = FakeTask(backend=FailingBackend())
+        recorder = ProgressRecorder(task)
+        with self.assertRaises(ConnectionError):
+            recorder.set_progress(50, 100)
+        state, meta = recorder.set_progress(50, 100)
+        self.assertEqual(meta['current'], 50)
+        self.assertEqual([meta['current'] for meta in task.backend.metas], [50])
+
+
+class BindTotalTest(unittest.TestCase):
+
+    def test_integer_boundaries(self):
+        for current, total, percent_int in [(49, 98, 50), (99, 110, 90), (77, 140, 55)]:
+            task = FakeTask()
+            ProgressRecorder(task).bind_total(total)(current)
+            self.assertEqual(task.backend.metas[-1]['percent_int'], percent_int)
+
+    def test_zero_total(self):
+        task = FakeTask()
+        ProgressRecorder(task).bind_total(0)(0)
+        meta = task.backend.metas[-1]
+        self.assertEqual((meta['percent'], meta['percent_int']), (0.0, 0))
+
+    def test_goes_through_set_progress(self):
+        calls = []
+
+        class RecordingProgressRecorder(ProgressRecorder):
+            def set_progress(self, current, total, description=""):
+                calls.append((current, total, description))
+                return super().set_progress(current, total, description)
+
+        RecordingProgressRecorder(FakeTask()).bind_total(10)(3, 'step')
+        self.assertEqual(calls, [(3, 10, 'step')])
+
+
+class BackgroundPublisherTest(unittest.TestCase):
+
+    def test_sync_path_uses_update_state(self):
+        task = FakeTask()
+        ProgressRecorder(task).set_progress(1, 10)
+        self.assertEqual(task.update_state_calls, 1)
+
+    def test_captured_request_reaches_backend(self):
+        task = FakeTask('captured-request')
+        recorder = ProgressRecorder(task, background=True)
+        recorder.set_progress(1, 10)
+        recorder.flush()
+        self.assertEqual(task.update_state_calls, 0)
+        task_id, state, meta, request = task.backend.writes[-1]
+        self.assertEqual(task_id, 'captured-request')
+        self.assertIs(request, task.request)
+
+    def test_flush_waits_and_keeps_newest_update(self):
+        task = FakeTask('newest-update', BlockingBackend())
+        recorder = ProgressRecorder(task, min_interval_s=0, background=True)
+        recorder.set_progress(1, 10)
+        self.assertTrue(task.backend.started.wait(5))
+        for current in range(2, 6):
+            recorder.set_progress(current, 10)
+
+        releaser = threading.Timer(0.1, task.backend.release.set)
+        releaser.start()
+        recorder.flush()
+        # flush() only returns once the held write and the newest queued one are stored
+        self.assertTrue(task.backend.release.is_set())
+        self.assertEqual([meta['current'] for meta in task.backend.metas], [1, 5])
+
+    def test_failed_write_is_logged_and_thread_survives(self):
+        task = FakeTask('failed-write', FailingBackend())
+        recorder = ProgressRecorder(task, min_interval_s=0, background=True)
+        with self.assertLogs('celery_progress.backend', 'ERROR'):
+            recorder.set_progress(1, 10)
+            recorder.flush()
+        recorder.set_progress(2, 10)
+        recorder.flush()
+        self.assertEqual([meta['current'] for meta in task.backend.metas], [2])
+
+
+if __name__ == '__main__':
+    unittest.main()